@@ -2,12 +2,19 @@
 """
 Update schema.org JSON-LD in index.html with all best-practice tweaks for DataCatalog, Datasets, Organization, and WebSite nodes.
 """
+import functools
 import json
-import re
+import string
 from pathlib import Path
 from datetime import datetime
 import os
 
+# orjson is optional: same output as the json.dumps fallback below for the (all-ASCII) schema, much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Paths
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 INDEX_HTML = PROJECT_ROOT / 'index.html'
@@ -53,15 +60,123 @@ ORG_SAMEAS = [
 # DATA_DOWNLOAD_URL = "https://www.prompteraid.com/api/images.json"
 DATA_DOWNLOAD_URL = None
 
-def get_sample_counts_and_dates():
-    """Read images.json and return per-model sample counts and dateModified info."""
-    with open(IMAGES_JSON, encoding='utf-8') as f:
-        data = json.load(f)
+# Graph nodes that don't depend on images.json; built once and reused on every update
+ORG_NODE = {
+    "@type": "Organization",
+    "@id": ORG_ID,
+    "name": "PrompterAid",
+    "url": "https://www.prompteraid.com/",
+    "logo": {
+        "@type": "ImageObject",
+        "url": LOGO_URL
+    },
+    "founder": {
+        "@type": "Person",
+        "@id": FOUNDER_ID,
+        "name": FOUNDER_NAME,
+        "sameAs": FOUNDER_SAMEAS
+    },
+    "sameAs": ORG_SAMEAS
+}
+WEBSITE_NODE = {
+    "@type": "WebSite",
+    "@id": "https://www.prompteraid.com/#website",
+    "name": "PrompterAid",
+    "url": "https://www.prompteraid.com/",
+    "description": "Free style-code library and 1-click prompt generator for NijiJourney 6 & Midjourney 7.",
+    "publisher": { "@id": ORG_ID },
+    "potentialAction": {
+        "@type": "SearchAction",
+        "target": "https://www.prompteraid.com/?sref={search_term_string}",
+        "query-input": "required name=search_term_string"
+    },
+    "about": { "@id": CATALOG_ID }
+}
+APP_NODE = {
+    "@type": "WebApplication",
+    "@id": "https://www.prompteraid.com/#app",
+    "name": "PrompterAid Prompt Generator",
+    "url": "https://www.prompteraid.com/",
+    "applicationCategory": "GraphicsApplication",
+    "operatingSystem": "All",
+    "softwareRequirements": "JavaScript; modern desktop & mobile browsers",
+    "isAccessibleForFree": True,
+    "offers": {
+        "@type": "Offer",
+        "price": "0",
+        "priceCurrency": "USD"
+    },
+    "creator": { "@id": "https://www.prompteraid.com/#website" }
+}
+
+# Every Dataset node starts from this; the None entries are filled in per model and
+# only fix the key order. The shared props (license, author, creator, ...) are
+# repeated on purpose: schema.org has no property inheritance, so a "defaults" node
+# referenced by @id would leave each Dataset without them for Google Dataset Search.
+_DATASET_TEMPLATE = {
+    "@type": "Dataset",
+    "@id": None,
+    "name": None,
+    "identifier": None,
+    "dateModified": None,
+    "license": LICENSE_URL,
+    "keywords": None,
+    "author": { "@id": FOUNDER_ID },
+    "creator": { "@id": ORG_ID },
+    "description": None,
+    "inLanguage": "en",
+    "isAccessibleForFree": True,
+    "includedInDataCatalog": { "@id": CATALOG_ID },
+    "additionalProperty": None
+}
+
+# Markers around the JSON-LD block; both pages contain exactly one
+SCHEMA_OPEN = '<script type="application/ld+json">'
+SCHEMA_CLOSE = '</script>'
+
+def find_schema_block(html):
+    """
+    Return (start, end) of the JSON text inside the JSON-LD script tag, or None if absent.
+    Accepts str or bytes; the markers are ASCII, so undecoded UTF-8 works the same.
+    """
+    if isinstance(html, bytes):
+        open_marker, close_marker = SCHEMA_OPEN.encode(), SCHEMA_CLOSE.encode()
+    else:
+        open_marker, close_marker = SCHEMA_OPEN, SCHEMA_CLOSE
+    start = html.find(open_marker)
+    if start == -1:
+        return None
+    start += len(open_marker)
+    end = html.find(close_marker, start)
+    if end == -1:
+        return None
+    return start, end
+
+def encode_json_ld(obj):
+    """
+    Serialize a JSON-LD structure to UTF-8 bytes with 2-space indentation.
+    The stdlib fallback keeps the default ensure_ascii=True, the encoder's fast path;
+    the schema is all ASCII, and anything else would still come out valid as \\uXXXX.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+@functools.lru_cache(maxsize=8)
+def _counts_cached(path, mtime_ns, size):
+    """
+    Parse images.json and compute the counts and dates. Cached on (path, mtime_ns, size),
+    so an unchanged file is parsed once per process and only the small result is kept.
+    """
+    with open(path, 'rb') as f:
+        data = json.loads(f.read())
     sets = data.get('sets', {})
     per_model = {}
     per_model_dates = {}
     total = 0
-    all_dates = []
+    # Fallback for sets without dateModified: images.json mtime, from the stat already taken
+    fallback_date = datetime.utcfromtimestamp(mtime_ns // 1_000_000_000).strftime('%Y-%m-%d')
+    catalog_date = None
     for model in MODELS:
         key = model['key']
         val = sets.get(key, {})
@@ -69,82 +184,34 @@ def get_sample_counts_and_dates():
         per_model[key] = count
         total += count
         # Try to get dateModified from images.json, else fallback to file mtime
-        date = val.get('dateModified')
-        if not date:
-            # fallback: use images.json mtime
-            date = datetime.utcfromtimestamp(os.path.getmtime(IMAGES_JSON)).strftime('%Y-%m-%d')
+        date = val.get('dateModified') or fallback_date
         per_model_dates[key] = date
-        all_dates.append(date)
-    # Catalog date is latest
-    catalog_date = max(all_dates)
+        # Catalog date is latest
+        if catalog_date is None or date > catalog_date:
+            catalog_date = date
     return total, per_model, per_model_dates, catalog_date
 
-def update_schema_in_index():
-    """Update the schema.org JSON-LD in index.html with all best-practice tweaks."""
-    with open(INDEX_HTML, encoding='utf-8') as f:
-        html = f.read()
-
-    # Find the <script type="application/ld+json"> ... </script> block
-    pattern = re.compile(r'(<script type="application/ld\+json">)(.*?)(</script>)', re.DOTALL)
-    match = pattern.search(html)
-    if not match:
-        print("❌ Could not find schema.org JSON-LD block in index.html!")
-        return False
-
-    prefix, json_text, suffix = match.groups()
-
-    # Get counts and dates
-    total, per_model, per_model_dates, catalog_date = get_sample_counts_and_dates()
+def get_sample_counts_and_dates():
+    """Read images.json and return per-model sample counts and dateModified info."""
+    st = os.stat(IMAGES_JSON)
+    total, per_model, per_model_dates, catalog_date = _counts_cached(str(IMAGES_JSON), st.st_mtime_ns, st.st_size)
+    # Copies, so callers can't alter the cached result
+    return total, dict(per_model), dict(per_model_dates), catalog_date
 
-    # Build the new JSON-LD structure
-    org = {
-        "@type": "Organization",
-        "@id": ORG_ID,
-        "name": "PrompterAid",
-        "url": "https://www.prompteraid.com/",
-        "logo": {
-            "@type": "ImageObject",
-            "url": LOGO_URL
-        },
-        "founder": {
-            "@type": "Person",
-            "@id": FOUNDER_ID,
-            "name": FOUNDER_NAME,
-            "sameAs": FOUNDER_SAMEAS
-        },
-        "sameAs": ORG_SAMEAS
-    }
-    website = {
-        "@type": "WebSite",
-        "@id": "https://www.prompteraid.com/#website",
-        "name": "PrompterAid",
-        "url": "https://www.prompteraid.com/",
-        "description": "Free style-code library and 1-click prompt generator for NijiJourney 6 & Midjourney 7.",
-        "publisher": { "@id": ORG_ID },
-        "potentialAction": {
-            "@type": "SearchAction",
-            "target": "https://www.prompteraid.com/?sref={search_term_string}",
-            "query-input": "required name=search_term_string"
-        },
-        "about": { "@id": CATALOG_ID }
-    }
+def build_schema(total, per_model, per_model_dates, catalog_date):
+    """Build the index.html JSON-LD document from the sample counts and dates."""
+    # Build the new JSON-LD structure around the static nodes
     datasets = []
     for model in MODELS:
         key = model['key']
         dataset = {
-            "@type": "Dataset",
+            **_DATASET_TEMPLATE,
             "@id": model['dataset_id'],
             "name": model['name'],
             "identifier": model['identifier'],
             "dateModified": per_model_dates[key],
-            "license": LICENSE_URL,
             "keywords": model['keywords'],
-            "author": { "@id": FOUNDER_ID },
-            "creator": { "@id": ORG_ID },
             "description": model['description'],
-            "inLanguage": "en",
-            "isAccessibleForFree": True,
-            "includedInDataCatalog": { "@id": CATALOG_ID },
             "additionalProperty": [{
                 "@type": "PropertyValue",
                 "name": "numSamples",
@@ -172,29 +239,62 @@ def update_schema_in_index():
             "value": total
         }]
     }
-    app = {
-        "@type": "WebApplication",
-        "@id": "https://www.prompteraid.com/#app",
-        "name": "PrompterAid Prompt Generator",
-        "url": "https://www.prompteraid.com/",
-        "applicationCategory": "GraphicsApplication",
-        "operatingSystem": "All",
-        "softwareRequirements": "JavaScript; modern desktop & mobile browsers",
-        "isAccessibleForFree": True,
-        "offers": {
-            "@type": "Offer",
-            "price": "0",
-            "priceCurrency": "USD"
-        },
-        "creator": { "@id": "https://www.prompteraid.com/#website" }
-    }
-    graph = [website, org, catalog, app]
-    new_json_text = json.dumps({"@context": "https://schema.org", "@graph": graph}, indent=2, ensure_ascii=False)
-    new_block = f'{prefix}\n{new_json_text}\n{suffix}'
-    new_html = pattern.sub(new_block, html)
+    graph = [WEBSITE_NODE, ORG_NODE, catalog, APP_NODE]
+    return {"@context": "https://schema.org", "@graph": graph}
 
-    with open(INDEX_HTML, 'w', encoding='utf-8') as f:
-        f.write(new_html)
+@functools.lru_cache(maxsize=None)
+def _schema_template():
+    """
+    Serialize the schema once with placeholder values and turn it into a string.Template,
+    so rendering only has to substitute the counts and dates.
+    """
+    placeholders = {}
+    def placeholder(name):
+        value = f'@@{name}@@'
+        placeholders[name] = f'"{value}"'
+        return value
+    per_model = {model['key']: placeholder(f"count_{model['key']}") for model in MODELS}
+    per_model_dates = {model['key']: placeholder(f"date_{model['key']}") for model in MODELS}
+    schema = build_schema(placeholder('total'), per_model, per_model_dates, placeholder('catalog_date'))
+    text = encode_json_ld(schema).decode('utf-8').replace('$', '$$')
+    for name, quoted in placeholders.items():
+        text = text.replace(quoted, '${' + name + '}')
+    return string.Template(text)
+
+def render_schema(total, per_model, per_model_dates, catalog_date):
+    """Return the index.html JSON-LD as UTF-8 bytes; same output as encode_json_ld(build_schema(...))."""
+    values = {'total': total, 'catalog_date': catalog_date}
+    for key, count in per_model.items():
+        values[f'count_{key}'] = count
+    for key, date in per_model_dates.items():
+        values[f'date_{key}'] = date
+    # Each placeholder stands for a whole JSON value, so substitute JSON-encoded values
+    return _schema_template().substitute({name: json.dumps(value) for name, value in values.items()}).encode('utf-8')
+
+def update_schema_in_index():
+    """Update the schema.org JSON-LD in index.html with all best-practice tweaks."""
+    # The page is spliced as raw UTF-8 bytes; only the JSON-LD block is regenerated
+    html = INDEX_HTML.read_bytes()
+
+    # Find the <script type="application/ld+json"> ... </script> block
+    block = find_schema_block(html)
+    if not block:
+        print("❌ Could not find schema.org JSON-LD block in index.html!")
+        return False
+
+    # Get counts and dates
+    total, per_model, per_model_dates, catalog_date = get_sample_counts_and_dates()
+
+    new_json = render_schema(total, per_model, per_model_dates, catalog_date)
+    start, end = block
+    new_html = b''.join((html[:start], b'\n', new_json, b'\n', html[end:]))
+
+    # Leave the file (and its mtime) alone when nothing changed
+    if new_html == html:
+        print(f"✅ index.html schema.org JSON-LD already up to date. Total: {total}")
+        return True
+
+    INDEX_HTML.write_bytes(new_html)
     print(f"✅ Updated schema.org JSON-LD with all best-practice tweaks. Total: {total}")
     return True
 
@@ -218,14 +318,14 @@ def update_schema_in_docs():
                 html = f.read()
 
     # Find the <script type="application/ld+json"> ... </script> block
-    pattern = re.compile(r'(<script type="application/ld\+json">)(.*?)(</script>)', re.DOTALL)
-    match = pattern.search(html)
-    if not match:
+    block = find_schema_block(html)
+    if not block:
         print(f"❌ Could not find schema.org JSON-LD block in docs.html!")
         print(f"   File content preview: {html[:200]}...")
         return False
 
-    prefix, json_text, suffix = match.groups()
+    start, end = block
+    json_text = html[start:end]
 
     # Parse existing JSON
     try:
@@ -246,8 +346,7 @@ def update_schema_in_docs():
 
     # Convert back to JSON and update the file
     new_json_text = json.dumps(schema_data, indent=2, ensure_ascii=False)
-    new_block = f'{prefix}\n{new_json_text}\n{suffix}'
-    new_html = pattern.sub(new_block, html)
+    new_html = f'{html[:start]}\n{new_json_text}\n{html[end:]}'
 
     with open(DOCS_HTML, 'w', encoding='utf-8') as f:
         f.write(new_html)
@@ -5,36 +5,31 @@ Fix duplicate entries in images.json
 This script removes duplicate image entries from the images.json file
 based on the path field. It preserves the first occurrence of each path
 and removes subsequent duplicates.
+
+The file is written compact, in the same format as update_images_json.py,
+unless --pretty is given.
 """
 
+import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
-def fix_duplicates_in_images_json():
-    """Remove duplicate entries from images.json based on path field."""
-    
-    # Define paths
-    project_root = Path(__file__).parent.parent
-    json_path = project_root / "api" / "images.json"
-    
-    if not json_path.exists():
-        print(f"Error: {json_path} does not exist")
-        return False
-    
-    print(f"Loading {json_path}...")
+def dedup_images_inplace(data: dict) -> int:
+    """
+    Remove duplicate image entries from loaded images.json data.
     
-    # Load the JSON file
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"Error loading JSON file: {e}")
-        return False
+    Operates on the in-memory dict so pipeline steps that already hold the
+    parsed data can reuse it without another load/save round trip.
     
-    # Track duplicates and fixes
+    Args:
+        data: Parsed images.json contents (modified in place)
+        
+    Returns:
+        Number of duplicate entries removed
+    """
     total_duplicates = 0
-    fixes_made = False
     
     # Process each model's images
     for model_id, model_data in data.get("sets", {}).items():
@@ -54,7 +49,6 @@ def fix_duplicates_in_images_json():
             if path in seen_paths:
                 # This is a duplicate
                 duplicates_found.append(path)
-                total_duplicates += 1
             else:
                 # First time seeing this path
                 seen_paths.add(path)
@@ -71,20 +65,57 @@ def fix_duplicates_in_images_json():
                 print(f"    - {dup}")
             
             model_data["images"] = unique_images
-            fixes_made = True
+            total_duplicates += len(duplicates_found)
         else:
             print(f"\nModel {model_id}: No duplicates found ({original_count} images)")
     
-    if fixes_made:
-        # Write the fixed JSON back to file
+    return total_duplicates
+
+def fix_duplicates_in_images_json(pretty=False):
+    """
+    Remove duplicate entries from images.json based on path field.
+    
+    Writes compact JSON like update_images_json.py, or indented JSON if pretty is set.
+    """
+    
+    # Define paths
+    project_root = Path(__file__).parent.parent
+    json_path = project_root / "api" / "images.json"
+    
+    if not json_path.exists():
+        print(f"Error: {json_path} does not exist")
+        return False
+    
+    print(f"Loading {json_path}...")
+    
+    # Load the JSON file
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"Error loading JSON file: {e}")
+        return False
+    
+    total_duplicates = dedup_images_inplace(data)
+    
+    if total_duplicates:
+        # Write the fixed JSON next to the original, then swap it in atomically
+        # so an interrupted run never leaves a truncated images.json behind
         print(f"\nWriting fixed JSON to {json_path}...")
+        tmp_path = json_path.with_suffix(".json.tmp")
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if pretty:
+                payload = json.dumps(data, indent=2, ensure_ascii=False)
+            else:
+                payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+            with open(tmp_path, 'wb') as f:
+                f.write(payload.encode('utf-8'))
+            os.replace(tmp_path, json_path)
             print(f"Successfully removed {total_duplicates} duplicate entries")
             return True
         except Exception as e:
             print(f"Error writing JSON file: {e}")
+            tmp_path.unlink(missing_ok=True)
             return False
     else:
         print("\nNo duplicates found. File is already clean.")
@@ -92,10 +123,14 @@ def fix_duplicates_in_images_json():
 
 def main():
     """Main function to run the duplicate fixing script."""
+    parser = argparse.ArgumentParser(description="Remove duplicate image entries from api/images.json")
+    parser.add_argument("--pretty", action="store_true", help="Write indented JSON instead of compact JSON")
+    args = parser.parse_args()
+    
     print("🔧 PrompterAid Duplicate Image Fixer")
     print("=" * 40)
     
-    success = fix_duplicates_in_images_json()
+    success = fix_duplicates_in_images_json(pretty=args.pretty)
     
     if success:
         print("\n✅ Duplicate fixing completed successfully!")
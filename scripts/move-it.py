@@ -20,20 +20,40 @@ This script is typically run before process.py to prepare files for web processi
 Author: PrompterAid Team
 """
 
+import argparse
 import os
+import hashlib
 import re
 import shutil
+import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Set, Tuple, Optional, Union
 from PIL import Image
 import sys
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 # --- CONFIG ---
-PROJECT_ROOT = Path(r"C:/Users/imiko/Documents/GitHub/website/prompteraid")
+# Overridable via environment (PROMPTERAID_ROOT, PROMPTERAID_DOWNLOADS) or --dest/--downloads
+PROJECT_ROOT = Path(os.environ.get("PROMPTERAID_ROOT", Path(__file__).resolve().parents[1]))
 SOURCE_IMG_ROOT = PROJECT_ROOT / "data" / "source-images"  # Destination for processed files
-DOWNLOADS_SREF_ROOT = Path(r"C:/Users/imiko/Downloads/sref")  # Source downloads folder
+DOWNLOADS_SREF_ROOT = Path(os.environ.get("PROMPTERAID_DOWNLOADS", Path.home() / "Downloads" / "sref"))  # Source downloads folder
 MODEL_FOLDERS = {"niji6": "niji-6", "mj7": "midjourney-7"}  # Model ID to folder mapping
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 2)  # Parallel copies in copy_files_to_source
+FICLONE = 0x40049409  # Linux ioctl that shares the source extents with the destination
+
+# Filename cleanup patterns, compiled once for the rename pass
+_UNWANTED_RE = re.compile(r'jennajuffuffles|mermaid', re.IGNORECASE)
+_UNDERSCORES_RE = re.compile(r'_+')
+# Names clean_filename would leave unchanged ("<id>_<rest>.png"), used to skip the cleanup
+_CANONICAL_RE = re.compile(
+    r'^(?!.*(?:jennajuffuffles|mermaid))\d+_[A-Za-z0-9.-]+(?:_[A-Za-z0-9.-]+)*\.png$',
+    re.IGNORECASE)
 
 def clean_filename(filename: str) -> str:
     """
@@ -49,18 +69,28 @@ def clean_filename(filename: str) -> str:
         Cleaned filename with standardized format
     """
     # Remove unwanted substrings and fix underscores/spaces
-    name = filename
-    name = re.sub(r'jennajuffuffles|mermaid', '', name, flags=re.IGNORECASE)
-    name = re.sub(r'\s+', '', name)
-    name = re.sub(r'_+', '_', name)
-    name = re.sub(r'^_+|_+$', '', name)
-    # Ensure only one underscore (between numeric and rest)
-    parts = name.split('_', 1)
-    if len(parts) == 2:
-        name = f"{parts[0]}_{parts[1]}"
-    else:
-        name = parts[0]
-    return name
+    name = _UNWANTED_RE.sub('', filename)
+    name = ''.join(name.split())
+    name = _UNDERSCORES_RE.sub('_', name)
+    return name.strip('_')
+
+def extract_id(filename: str) -> str:
+    """
+    Extract the numeric ID (leading run of digits) from a filename.
+    
+    Scans the digits directly instead of matching a regex; "123_x.png",
+    "123.png" and "123(1).png" all give "123".
+    
+    Args:
+        filename: Filename to inspect
+        
+    Returns:
+        The leading digits, or an empty string if the name doesn't start with one
+    """
+    end = 0
+    while end < len(filename) and filename[end].isdecimal():
+        end += 1
+    return filename[:end]
 
 def restart_script() -> None:
     """Restart the script from the beginning after resolving conflicts."""
@@ -84,13 +114,242 @@ def get_image_size(image_path: Path) -> Optional[Tuple[int, int]]:
     except Exception:
         return None
 
+def list_png_names(folder_path: Path) -> List[str]:
+    """
+    List the PNG filenames in a folder using a single directory scan.
+    
+    os.scandir returns DirEntry objects whose file-type information comes
+    from the directory listing itself, so regular files need no per-file
+    stat (symlinks are followed, as Path.is_file did). The extension test
+    is case-insensitive where the filesystem is (os.path.normcase).
+    
+    Args:
+        folder_path: Folder to scan
+        
+    Returns:
+        Names of the PNG files in the folder
+    """
+    with os.scandir(folder_path) as it:
+        return [entry.name for entry in it
+                if os.path.normcase(entry.name).endswith('.png') and entry.is_file()]
+
+def list_png_files(folder_path: Path) -> List[Path]:
+    """List the PNG files in a folder as paths (see list_png_names)."""
+    return [folder_path / name for name in list_png_names(folder_path)]
+
+class PendingChoice(NamedTuple):
+    """A rename conflict or duplicate group waiting for a decision in the folder batch."""
+    kind: str                               # 'conflict' (rename target exists) or 'duplicate'
+    label: str                              # Short description shown in the summary
+    files: List[Path]                       # Candidates; the user keeps one of them
+    sizes: List[Optional[Tuple[int, int]]]  # Image dimensions (None if unreadable)
+    identical: bool                         # All candidates have byte-identical content
+    default: str                            # Choice applied when the user gives none
+    suggestion: str                         # Size-based hint shown to the user, never applied on its own
+
+def suggest_choice(sizes: List[Optional[Tuple[int, int]]]) -> str:
+    """
+    Suggest which file to keep, as a hint shown next to a pending decision.
+    
+    When every dimension is known and one image is strictly the largest, that
+    one is suggested. Otherwise there is no suggestion ('s').
+    
+    Args:
+        sizes: Image dimensions of the candidates
+        
+    Returns:
+        1-based index of the file to keep, or 's' to skip
+    """
+    if not all(sizes) or len(set(sizes)) == 1:
+        return 's'
+    areas = [w * h for w, h in sizes]
+    largest = max(areas)
+    if areas.count(largest) > 1:
+        return 's'
+    return str(areas.index(largest) + 1)
+
+def file_digest(path: Path) -> bytes:
+    """Hash a file's contents with BLAKE2b, reading it in 64 KiB chunks."""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def sniff_digest(path: Union[str, Path]) -> bytes:
+    """Hash the first 64 KiB of a file, enough to tell distinct PNGs apart."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(65536)).digest()
+
+def files_identical(files: List[Path]) -> bool:
+    """
+    Check whether files have byte-identical content.
+    
+    Compares file sizes first so differing files are rejected without
+    reading them, then compares content hashes.
+    """
+    if len({file.stat().st_size for file in files}) > 1:
+        return False
+    return len({file_digest(file) for file in files}) == 1
+
+def make_pending(kind: str, label: str, files: List[Path]) -> PendingChoice:
+    """Build a PendingChoice, reading image sizes to suggest which file to keep."""
+    sizes = [get_image_size(file) for file in files]
+    identical = files_identical(files)
+    # Identical copies need no human judgement: keep the shortest name (the
+    # original rather than a "(1)" re-download). Differing images are never
+    # deleted by default; the size suggestion is only a hint.
+    if identical:
+        default = str(min(range(len(files)), key=lambda i: len(files[i].name)) + 1)
+    else:
+        default = 's'
+    return PendingChoice(kind, label, files, sizes, identical, default, suggest_choice(sizes))
+
+def preview_files(files: List[Path]) -> None:
+    """Open images in the system viewer, launching all viewers without waiting."""
+    if sys.platform == 'darwin':
+        command = ['open', '-a', 'Preview']
+    else:
+        command = ['xdg-open']
+    for file in files:
+        try:
+            if sys.platform == 'win32':
+                os.startfile(str(file))
+            else:
+                subprocess.Popen(command + [str(file)])
+        except Exception as e:
+            print(f"Could not open images for preview: {e}")
+
+def parse_batch_choices(response: str, pending: List[PendingChoice]) -> List[str]:
+    """
+    Parse a compact batch response such as "1:2,2:s,3:1".
+    
+    Each entry is item:choice, where choice is the 1-based file to keep or
+    's' to skip. Items that are not mentioned keep their default choice.
+    
+    Args:
+        response: Raw user input
+        pending: Decisions the response refers to
+        
+    Returns:
+        One choice per pending decision
+        
+    Raises:
+        ValueError: If an entry is malformed or out of range
+    """
+    choices = [item.default for item in pending]
+    for entry in filter(None, (part.strip() for part in response.split(','))):
+        number, sep, choice = entry.partition(':')
+        number, choice = number.strip(), choice.strip()
+        if not sep or not number.isdigit() or not 1 <= int(number) <= len(pending):
+            raise ValueError(f"'{entry}' is not item:choice with item 1-{len(pending)}")
+        item = pending[int(number) - 1]
+        if choice != 's' and not (choice.isdigit() and 1 <= int(choice) <= len(item.files)):
+            raise ValueError(f"'{entry}': choose 1-{len(item.files)} or s")
+        choices[int(number) - 1] = choice
+    return choices
+
+def ask_batch_choices(pending: List[PendingChoice]) -> List[str]:
+    """
+    Show every pending decision for a folder and read the answers in one go.
+    
+    Args:
+        pending: Decisions gathered while scanning the folder
+        
+    Returns:
+        One choice per pending decision (1-based file to keep, or 's')
+    """
+    print(f"\n{len(pending)} decision(s) pending:")
+    for number, item in enumerate(pending, 1):
+        default = "skip" if item.default == 's' else f"keep {item.default}"
+        if item.identical:
+            note = ", identical content"
+        elif item.suggestion != 's':
+            note = f", largest is {item.suggestion}"
+        else:
+            note = ""
+        print(f"  [{number}] {item.label} (default: {default}{note})")
+        for index, (file, size) in enumerate(zip(item.files, item.sizes), 1):
+            print(f"      {index}. {file.name}  {size if size else 'size unknown'}")
+    
+    response = input("Preview images for which items? (e.g. 1,3 / a = all / Enter = none): ").strip().lower()
+    if response:
+        numbers = range(1, len(pending) + 1) if response == 'a' else \
+            [int(n) for n in response.split(',') if n.strip().isdigit()]
+        for number in numbers:
+            if not 1 <= number <= len(pending):
+                continue
+            if pending[number - 1].identical:
+                print(f"  [{number}] has byte-identical files, nothing to compare")
+                continue
+            preview_files(pending[number - 1].files)
+    
+    while True:
+        response = input("Keep which file per item? (e.g. 1:2,2:s / Enter = defaults): ").strip().lower()
+        try:
+            return parse_batch_choices(response, pending)
+        except ValueError as e:
+            print(f"Invalid input: {e}")
+
+def apply_choice(item: PendingChoice, choice: str, report: List[str], touched: Set[Path]) -> bool:
+    """
+    Apply one batch decision.
+    
+    Decisions are gathered before any of them runs, so an item whose files were
+    renamed, replaced or deleted by an earlier decision in the same batch is
+    stale: it is skipped and comes up again in the re-scan.
+    
+    Args:
+        item: The decision to apply
+        choice: 1-based index of the file to keep, or 's' to skip
+        report: Report list to append actions to
+        touched: Files changed earlier in this batch; updated with this item's changes
+        
+    Returns:
+        True if any file was deleted or renamed
+    """
+    if choice == 's':
+        print(f"Skipped: {item.label}")
+        return False
+    stale = [file for file in item.files if file in touched]
+    if stale:
+        print(f"Skipped: {item.label} ({stale[0].name} changed earlier in this batch, will be re-scanned)")
+        return False
+    missing = [file for file in item.files if not file.exists()]
+    if missing:
+        print(f"Skipped: {item.label} ({missing[0].name} no longer exists)")
+        return False
+    if item.identical and not files_identical(item.files):
+        print(f"Skipped: {item.label} (files are no longer identical)")
+        return False
+    
+    kept = item.files[int(choice) - 1]
+    if item.kind == 'conflict' and kept == item.files[0]:
+        # Keep the incoming file under the clean name, replacing the existing one
+        original, existing = item.files
+        existing.unlink()
+        original.rename(existing)
+        touched.update(item.files)
+        report.append(f"Renamed: {original.name} -> {existing.name} (existing deleted)")
+        print(f"Deleted: {existing}, Renamed: {original} -> {existing.name}")
+        return True
+    
+    for file in item.files:
+        if file != kept:
+            file.unlink()
+            touched.add(file)
+            print(f"Deleted: {file.name}")
+            report.append(f"Deleted duplicate: {file.name} (kept {kept.name})")
+    return True
+
 def rename_and_check_duplicates_in_model_folders() -> List[str]:
     """
     Rename files in downloads folder and resolve conflicts/duplicates.
     
     Processes all PNG files in the downloads model folders, cleaning filenames
     and handling conflicts when multiple files would have the same name.
-    Provides interactive resolution for conflicts and duplicate detection.
+    Conflicts and duplicates are collected per folder and resolved in a
+    single batch prompt.
     
     Returns:
         List of report messages describing actions taken
@@ -108,122 +367,66 @@ def rename_and_check_duplicates_in_model_folders() -> List[str]:
                 
             print(f"\nProcessing {model_id} model folder...")
             print(f"  Processing folder: {folder_path}")
-            seen: Dict[str, Path] = {}
-            dups: List[Tuple[Path, Path]] = []
+            # The loop works on plain strings; Path objects are only built
+            # for the (rare) entries that end up in the batch prompt
+            folder_str = str(folder_path)
+            join = os.path.join
+            first_by_id: Dict[str, Optional[str]] = {}
+            seen: Dict[Tuple[str, bytes], str] = {}
+            pending: List[PendingChoice] = []
             
-            for png in folder_path.glob("*.png"):
-                new_name = clean_filename(png.name)
-                new_path = png.parent / new_name
-                
-                if png.name != new_name:
-                    if new_path.exists():
-                        print(f"\nCONFLICT: {png} would be renamed to {new_path}, but it already exists.")
-                        
-                        # Check if images are different sizes
-                        size1 = get_image_size(png)
-                        size2 = get_image_size(new_path)
-                        show_images = False
-                        
-                        if size1 and size2 and size1 != size2:
-                            print(f"Images have different sizes: {size1} vs {size2}")
-                            show_images = True
-                        elif size1 and size2 and size1 == size2:
-                            print(f"Images have the same size: {size1}")
-                            show_images = input("Show images anyway? (y/n): ").strip().lower() == 'y'
-                        else:
-                            print("Could not determine image sizes")
-                            show_images = input("Show images? (y/n): ").strip().lower() == 'y'
-                        
-                        if show_images:
-                            try:
-                                os.startfile(str(png))
-                                os.startfile(str(new_path))
-                            except Exception as e:
-                                print(f"Could not open images for preview: {e}")
-                        
-                        while True:
-                            choice = input(f"Delete (1) original [{png.name}], (2) existing [{new_name}], or (s)kip? [1/2/s]: ").strip().lower()
-                            if choice == '1':
-                                png.unlink()
-                                print(f"Deleted: {png}")
-                                conflicts_resolved = True
-                                current_conflicts = True
-                                break
-                            elif choice == '2':
-                                new_path.unlink()
-                                png.rename(new_path)
-                                report.append(f"Renamed: {png.name} -> {new_name} (existing deleted)")
-                                print(f"Deleted: {new_path}, Renamed: {png} -> {new_name}")
-                                conflicts_resolved = True
-                                current_conflicts = True
-                                break
-                            elif choice == 's':
-                                print("Skipped both files.")
-                                current_conflicts = True
-                                break
-                            else:
-                                print("Invalid input. Please enter 1, 2, or s.")
-                    else:
-                        png.rename(new_path)
-                        report.append(f"Renamed: {png.name} -> {new_name}")
+            for name in list_png_names(folder_path):
+                path = join(folder_str, name)
+                if _CANONICAL_RE.match(name):
+                    # Already clean: no cleanup and no filesystem work needed
+                    new_name = name
+                    new_path = path
                 else:
-                    new_path = png
+                    new_name = clean_filename(name)
+                    new_path = join(folder_str, new_name)
+                
+                if name != new_name:
+                    if os.path.exists(new_path):
+                        if files_identical([Path(path), Path(new_path)]):
+                            # Same bytes under both names: drop the incoming copy, no prompt needed
+                            os.unlink(path)
+                            report.append(f"Auto-dropped identical: {name} (same content as {new_name})")
+                            print(f"  Auto-resolved identical-content conflict: {name} -> {new_name}")
+                            continue
+                        print(f"  CONFLICT: {name} would be renamed to {new_name}, but it already exists.")
+                        pending.append(make_pending(
+                            'conflict', f"Rename conflict: {name} -> {new_name}", [Path(path), Path(new_path)]))
+                        continue  # The existing file takes part in the duplicate check itself
+                    os.rename(path, new_path)
+                    report.append(f"Renamed: {name} -> {new_name}")
                     
-                prefix = new_name[:10]
-                if prefix in seen:
-                    dups.append((seen[prefix], new_path))
+                # Only files sharing an ID get fingerprinted; a repeated
+                # (ID, fingerprint) key marks a likely exact duplicate
+                file_id = extract_id(new_name) or new_name
+                if file_id not in first_by_id:
+                    first_by_id[file_id] = new_path
+                    continue
+                first = first_by_id[file_id]
+                if first is not None:
+                    seen[(file_id, sniff_digest(first))] = first
+                    first_by_id[file_id] = None  # Fingerprinted already
+                key = (file_id, sniff_digest(new_path))
+                if key in seen:
+                    print(f"  DUPLICATE: {os.path.basename(seen[key])} <-> {new_name}")
+                    pending.append(make_pending(
+                        'duplicate', f"Duplicate content for ID '{file_id}'", [Path(seen[key]), Path(new_path)]))
                 else:
-                    seen[prefix] = new_path
-                    
-            if dups:
-                print(f"\nDUPLICATES FOUND in {folder_path}:")
-                for a, b in dups:
-                    print(f"  {a.name} <-> {b.name}")
-                    
-                    # Check if images are different sizes
-                    size1 = get_image_size(a)
-                    size2 = get_image_size(b)
-                    show_images = False
-                    
-                    if size1 and size2 and size1 != size2:
-                        print(f"Images have different sizes: {size1} vs {size2}")
-                        show_images = True
-                    elif size1 and size2 and size1 == size2:
-                        print(f"Images have the same size: {size1}")
-                        show_images = input("Show images anyway? (y/n): ").strip().lower() == 'y'
-                    else:
-                        print("Could not determine image sizes")
-                        show_images = input("Show images? (y/n): ").strip().lower() == 'y'
-                    
-                    if show_images:
-                        try:
-                            os.startfile(str(a))
-                            os.startfile(str(b))
-                        except Exception as e:
-                            print(f"Could not open images for preview: {e}")
+                    seen[key] = new_path
                     
-                    while True:
-                        choice = input(f"Delete (1) first [{a.name}], (2) second [{b.name}], or (s)kip? [1/2/s]: ").strip().lower()
-                        if choice == '1':
-                            a.unlink()
-                            print(f"Deleted: {a}")
-                            conflicts_resolved = True
-                            current_conflicts = True
-                            break
-                        elif choice == '2':
-                            b.unlink()
-                            print(f"Deleted: {b}")
-                            conflicts_resolved = True
-                            current_conflicts = True
-                            break
-                        elif choice == 's':
-                            print("Skipped both files.")
-                            current_conflicts = True
-                            break
-                        else:
-                            print("Invalid input. Please enter 1, 2, or s.")
+            if pending:
+                choices = ask_batch_choices(pending)
+                touched: Set[Path] = set()
+                for item, choice in zip(pending, choices):
+                    if apply_choice(item, choice, report, touched):
+                        conflicts_resolved = True
+                        current_conflicts = True
         
-        # If no conflicts were found in this pass, we're done
+        # If nothing changed in this pass, we're done
         if not current_conflicts:
             break
         else:
@@ -238,8 +441,8 @@ def check_duplicate_ids() -> List[str]:
     Check for duplicate IDs (numeric sequence before underscore) in each model folder.
     
     AI generators sometimes create multiple files with the same numeric ID but
-    different suffixes. This function groups files by their ID and allows
-    interactive selection of which file to keep.
+    different suffixes. This function groups files by their ID and asks, in one
+    batch per folder, which file of each group to keep.
     
     Returns:
         List of report messages describing actions taken
@@ -255,86 +458,73 @@ def check_duplicate_ids() -> List[str]:
         print(f"\nChecking for duplicate IDs in {model_id} model folder...")
         print(f"  Processing folder: {folder_path}")
         
-        # Group files by their ID (numeric part before underscore)
+        # Group files by their ID (leading digits of the name)
         id_groups: Dict[str, List[Path]] = {}
-        for png in folder_path.glob("*.png"):
+        for png in list_png_files(folder_path):
             # Extract the numeric ID from filename (e.g., "123_something.png" -> "123")
-            match = re.match(r'^(\d+)', png.name)
-            if match:
-                file_id = match.group(1)
-                if file_id not in id_groups:
-                    id_groups[file_id] = []
-                id_groups[file_id].append(png)
+            file_id = extract_id(png.name)
+            if file_id:
+                id_groups.setdefault(file_id, []).append(png)
         
-        # Check for duplicates
-        duplicates_found = False
-        for file_id, files in id_groups.items():
-            if len(files) > 1:
-                duplicates_found = True
-                print(f"\nDUPLICATE ID '{file_id}' found in {folder_path}:")
-                for i, file in enumerate(files, 1):
-                    print(f"  {i}. {file.name}")
-                
-                # Check if images are different sizes
-                sizes: List[Optional[Tuple[int, int]]] = []
-                for file in files:
-                    size = get_image_size(file)
-                    sizes.append(size)
-                    print(f"     Size: {size}")
-                
-                # Determine if we should show images
-                show_images = False
-                if all(sizes) and len(set(sizes)) > 1:
-                    print(f"Images have different sizes - showing for comparison")
-                    show_images = True
-                elif all(sizes) and len(set(sizes)) == 1:
-                    print(f"Images have the same size: {sizes[0]}")
-                    show_images = input("Show images anyway? (y/n): ").strip().lower() == 'y'
-                else:
-                    print("Could not determine some image sizes")
-                    show_images = input("Show images? (y/n): ").strip().lower() == 'y'
-                
-                if show_images:
-                    try:
-                        for file in files:
-                            os.startfile(str(file))
-                            time.sleep(0.5)  # Small delay between opening files
-                    except Exception as e:
-                        print(f"Could not open images for preview: {e}")
-                
-                while True:
-                    print(f"Choose which file to keep (1-{len(files)}) or (s)kip all:")
-                    choice = input(f"Enter choice [1-{len(files)}/s]: ").strip().lower()
-                    
-                    if choice == 's':
-                        print("Skipped all files with duplicate ID.")
-                        break
-                    elif choice.isdigit():
-                        file_index = int(choice) - 1
-                        if 0 <= file_index < len(files):
-                            # Keep the chosen file, delete the others
-                            chosen_file = files[file_index]
-                            for i, file in enumerate(files):
-                                if i != file_index:
-                                    file.unlink()
-                                    print(f"Deleted: {file.name}")
-                                    report.append(f"Deleted duplicate: {file.name} (kept {chosen_file.name})")
-                            
-                            print(f"Kept: {chosen_file.name}")
-                            conflicts_resolved = True
-                            break
-                        else:
-                            print(f"Invalid file number. Please enter 1-{len(files)} or s.")
-                    else:
-                        print(f"Invalid input. Please enter 1-{len(files)} or s.")
-        
-        if not duplicates_found:
+        pending = [make_pending('duplicate', f"Duplicate ID '{file_id}'", files)
+                   for file_id, files in id_groups.items() if len(files) > 1]
+        if not pending:
             print(f"  No duplicate IDs found in {model_id} folder.")
+            continue
+        
+        choices = ask_batch_choices(pending)
+        touched: Set[Path] = set()
+        for item, choice in zip(pending, choices):
+            if apply_choice(item, choice, report, touched):
+                conflicts_resolved = True
     
     if conflicts_resolved:
         restart_script()
     return report
 
+def copy_file_fast(src: Path, dst: Path) -> None:
+    """
+    Copy a file, avoiding data movement where the filesystem allows it.
+    
+    On Linux the destination is first cloned with the FICLONE ioctl (an O(1)
+    copy-on-write reflink on Btrfs/XFS), then copied in-kernel with
+    os.copy_file_range. Anything else falls back to shutil.copy2, which
+    uses the OS copy routine where there is one (CopyFile2 on Windows with
+    Python 3.12+). Metadata (including mtime) is preserved either way.
+    
+    Args:
+        src: File to copy
+        dst: Destination path (overwritten if it exists)
+    """
+    copied = False
+    if fcntl is not None and sys.platform.startswith('linux'):
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                copied = True
+            except OSError:
+                pass
+            if not copied and hasattr(os, 'copy_file_range'):
+                remaining = os.fstat(fsrc.fileno()).st_size
+                try:
+                    while remaining > 0:
+                        sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if sent == 0:
+                            break
+                        remaining -= sent
+                    copied = remaining == 0
+                except OSError:
+                    pass
+    if copied:
+        shutil.copystat(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+def _copy_pair(pair: Tuple[Path, Path]) -> Tuple[Path, Path]:
+    """Copy one (source, destination) pair and hand it back for reporting."""
+    copy_file_fast(*pair)
+    return pair
+
 def copy_files_to_source() -> Tuple[List[str], Dict[str, int]]:
     """
     Copy all PNG files from Downloads/sref model folders to source-images/model folders.
@@ -366,25 +556,37 @@ def copy_files_to_source() -> Tuple[List[str], Dict[str, int]]:
         source_folder_path.mkdir(parents=True, exist_ok=True)
         
         # Get all PNG files
-        png_files = list(downloads_folder_path.glob("*.png"))
+        png_files = list_png_files(downloads_folder_path)
         print(f"Found {len(png_files)} PNG files to copy")
         
         copied_count = 0
         skipped_count = 0
+        pairs: List[Tuple[Path, Path]] = []
+        log_lines: List[str] = []  # Written in one go; per-file console writes are slow
         
         for png_file in png_files:
             # Check if destination already exists
             dest_path = source_folder_path / png_file.name
             if dest_path.exists():
-                print(f"  Skipped (exists): {png_file.name}")
+                log_lines.append(f"  Skipped (exists): {png_file.name}")
                 skipped_count += 1
-                continue
             else:
-                # Simple copy
-                shutil.copy2(str(png_file), str(dest_path))
+                pairs.append((png_file, dest_path))
+        
+        # Copies are independent and I/O-bound, so overlap them on a thread pool
+        executor = ThreadPoolExecutor(max_workers=COPY_WORKERS)
+        try:
+            for png_file, dest_path in executor.map(_copy_pair, pairs):
                 report.append(f"Copied: {png_file} -> {dest_path}")
-                print(f"  Copied: {png_file.name}")
+                log_lines.append(f"  Copied: {png_file.name}")
                 copied_count += 1
+        except KeyboardInterrupt:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            if log_lines:
+                sys.stdout.write('\n'.join(log_lines) + '\n')
         
         print(f"  Summary: {copied_count} copied, {skipped_count} skipped")
         model_counts[model_id] = copied_count
@@ -424,6 +626,15 @@ def print_report(rename_report: List[str], duplicate_report: List[str],
     print(f"\nTotal processing time: {total_time:.2f} seconds")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rename, de-duplicate and copy downloaded sref images")
+    parser.add_argument("--downloads", type=Path, default=DOWNLOADS_SREF_ROOT,
+                        help=f"Downloads sref folder (default: {DOWNLOADS_SREF_ROOT})")
+    parser.add_argument("--dest", type=Path, default=SOURCE_IMG_ROOT,
+                        help=f"Destination source-images folder (default: {SOURCE_IMG_ROOT})")
+    args = parser.parse_args()
+    DOWNLOADS_SREF_ROOT = args.downloads
+    SOURCE_IMG_ROOT = args.dest
+    
     print("Starting move-it script...")
     print(f"Source: {DOWNLOADS_SREF_ROOT}")
     print(f"Destination: {SOURCE_IMG_ROOT}")
@@ -2,6 +2,11 @@
 """
 Image Processing Script for PrompterAid
 Splits source images into four 4:5 quadrants for Instagram optimization
+
+Most of the run time is the LANCZOS resize of every quadrant. Pillow-SIMD is a
+drop-in replacement with SSE4/AVX2 resampling kernels that makes that step several
+times faster; install it in place of Pillow (see requirements.txt). Its fast paths
+cover RGB images, which is the mode every quadrant is converted to before resizing.
 """
 
 import os
@@ -11,73 +16,87 @@ import argparse
 from pathlib import Path
 import numpy as np
 from collections import Counter
-import colorsys
 import concurrent.futures
 
+# Instagram 4:5 portrait output size
+TARGET_WIDTH = 1080
+TARGET_HEIGHT = 1350
+
+STYLE_ID_RE = re.compile(r'(\d+)_')
+
 def extract_style_id(filename):
     """Extract the style ID (first numeric code) from filename"""
-    match = re.match(r'(\d+)_', filename)
+    match = STYLE_ID_RE.match(filename)
     if match:
         return match.group(1)
     return None
 
+def colorful_pixel_mask(pixels):
+    """
+    Return a boolean mask of pixels that are saturated and neither too dark nor too light.
+    The HSV thresholds are applied in the uint8 domain with integer math for the whole
+    (N, 3) array at once: s > 0.25 is 4 * (max - min) > max, and 0.15 < v < 0.95 is
+    38 < max < 243 on the 0-255 scale.
+    """
+    cmax = pixels.max(axis=-1).astype(np.int16)
+    cmin = pixels.min(axis=-1).astype(np.int16)
+    return (
+        ((cmax - cmin) * 4 > cmax) &  # Saturation > 0.25 (colorful)
+        (cmax > 38) &                 # Value > 0.15 (not too dark)
+        (cmax < 243)                  # Value < 0.95 (not too light)
+    )
+
+def dominant_color(pixels):
+    """
+    Return the dominant color of an (N, 3) uint8 pixel array as an RGB tuple.
+    Colors are quantized to 5 bits per channel so near-identical pixels share a bin;
+    the fullest of the 32,768 bins is found with np.bincount and its center returned.
+    """
+    quantized = (pixels >> 3).astype(np.int32)
+    index = (quantized[:, 0] << 10) | (quantized[:, 1] << 5) | quantized[:, 2]
+    dominant = int(np.bincount(index, minlength=1 << 15).argmax())
+    return (
+        ((dominant >> 10) & 0x1F) << 3 | 4,
+        ((dominant >> 5) & 0x1F) << 3 | 4,
+        (dominant & 0x1F) << 3 | 4,
+    )
+
 def get_average_color(image_path):
     """
     Calculate the dominant subject color by ignoring background pixels and using the most frequent colorful pixel.
     Returns RGB tuple
     """
     try:
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary
-            if img.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Resize for faster processing
-            img_small = img.resize((100, 100), Image.Resampling.LANCZOS)
-            img_array = np.array(img_small)
-            pixels = img_array.reshape(-1, 3)
-            
-            # Convert to HSV for better filtering
-            hsv_pixels = np.array([colorsys.rgb_to_hsv(*(p/255.0)) for p in pixels])
-            
-            # Filter: keep only pixels with reasonable saturation and brightness
-            # (ignore very light, very dark, and gray pixels)
-            mask = (
-                (hsv_pixels[:,1] > 0.25) &  # Saturation > 0.25 (colorful)
-                (hsv_pixels[:,2] > 0.15) &  # Value > 0.15 (not too dark)
-                (hsv_pixels[:,2] < 0.95)    # Value < 0.95 (not too light)
-            )
-            filtered_pixels = pixels[mask]
-            
-            if len(filtered_pixels) == 0:
-                # Fallback: use all pixels if nothing passes the filter
-                filtered_pixels = pixels
-            
-            # Find the most common color (mode)
-            pixel_tuples = [tuple(p) for p in filtered_pixels]
-            most_common = Counter(pixel_tuples).most_common(1)
-            if most_common:
-                dominant_color = most_common[0][0]
-            else:
-                dominant_color = tuple(map(int, np.median(filtered_pixels, axis=0)))
-            
-            return tuple(map(int, dominant_color))
+        img = load_rgb_image(image_path)
+        
+        # Resize for faster processing
+        img_small = img.resize((100, 100), Image.Resampling.LANCZOS)
+        img_array = np.array(img_small)
+        pixels = img_array.reshape(-1, 3)
+        
+        # Filter: keep only pixels with reasonable saturation and brightness
+        # (ignore very light, very dark, and gray pixels)
+        filtered_pixels = pixels[colorful_pixel_mask(pixels)]
+        
+        if len(filtered_pixels) == 0:
+            # Fallback: use all pixels if nothing passes the filter
+            filtered_pixels = pixels
+        
+        # Find the most common color (mode)
+        return dominant_color(filtered_pixels)
     except Exception as e:
         print(f"Error analyzing color for {image_path}: {e}")
         return (128, 128, 128)  # Default gray
 
-def classify_color(rgb):
+# Color folder names, indexed by the codes classify_code returns
+COLOR_NAMES = ["black", "white", "red", "orange", "yellow", "green", "blue", "indigo", "violet", "misc"]
+BLACK, WHITE, RED, ORANGE, YELLOW, GREEN, BLUE, INDIGO, VIOLET, MISC = range(len(COLOR_NAMES))
+
+def classify_code(r, g, b):
     """
-    Classify RGB color into one of the specified color categories
-    Returns color name as string
+    Classify an RGB color into one of the color categories
+    Returns an index into COLOR_NAMES
     """
-    r, g, b = rgb
     # Calculate brightness and saturation
     brightness = (r + g + b) / 3
     max_val = max(r, g, b)
@@ -85,156 +104,229 @@ def classify_color(rgb):
     saturation = (max_val - min_val) / max_val if max_val > 0 else 0
     # Black and white classification (low saturation)
     if saturation < 0.15:
-        if brightness < 60:
-            print(f"  Classified as black (sat={saturation:.2f}, bright={brightness:.2f})")
-            return "black"
-        elif brightness > 180:
-            print(f"  Classified as white (sat={saturation:.2f}, bright={brightness:.2f})")
-            return "white"
-        else:
-            print(f"  Classified as black (low sat, sat={saturation:.2f}, bright={brightness:.2f})")
-            return "black"
+        return WHITE if brightness > 180 else BLACK
     if max_val == min_val:
-        print(f"  Classified as white (grayscale, sat={saturation:.2f}, bright={brightness:.2f})")
-        return "white"
-    # Calculate hue
-    h, s, v = colorsys.rgb_to_hsv(r/255.0, g/255.0, b/255.0)
-    hue = h * 360
-    # Debug output
-    print(f"  RGB: {rgb}, Hue: {hue:.1f}, Sat: {saturation:.2f}, Bright: {brightness:.2f}")
+        return WHITE
+    # Calculate hue in degrees from the extrema already at hand. A single division of
+    # integers keeps whole-degree hues exact, so boundary colors land in their range.
+    spread = max_val - min_val
+    if r == max_val:
+        hue = 60 * (g - b) / spread
+        if hue < 0:
+            hue += 360
+    elif g == max_val:
+        hue = 120 + 60 * (b - r) / spread
+    else:
+        hue = 240 + 60 * (r - g) / spread
     # Refined hue boundaries
     if (0 <= hue <= 12) or (348 <= hue <= 360):
-        return "red"
+        return RED
     elif 13 <= hue <= 40:
-        return "orange"
+        return ORANGE
     elif 41 <= hue <= 70:
-        return "yellow"
+        return YELLOW
     elif 71 <= hue <= 169:
-        return "green"
+        return GREEN
     elif 170 <= hue <= 250:
-        return "blue"
+        return BLUE
     elif 251 <= hue <= 275:
-        return "indigo"
+        return INDIGO
     elif 276 <= hue <= 347:
-        return "violet"
+        return VIOLET
     else:
-        return "misc"  # Default fallback
+        return MISC  # Default fallback
+
+def classify_color(rgb):
+    """
+    Classify RGB color into one of the specified color categories
+    Returns color name as string
+    """
+    return COLOR_NAMES[classify_code(*rgb)]
 
 def get_quadrant_center_color(quadrant_img):
     """
     Analyze the center 60% of a quadrant image and return the dominant color (mode of filtered pixels).
-    Optimized: resizes center crop to 40x40 for speed.
+    Optimized: box-averages the center crop down to 40x40 for speed.
     """
     w, h = quadrant_img.size
     left = int(w * 0.2)
     top = int(h * 0.2)
     right = int(w * 0.8)
     bottom = int(h * 0.8)
-    center_img = quadrant_img.crop((left, top, right, bottom)).resize((40, 40), quadrant_img.resample if hasattr(quadrant_img, 'resample') else 1)
+    center_img = quadrant_img.crop((left, top, right, bottom)).resize((40, 40), Image.Resampling.BOX)
     img_array = np.array(center_img)
     pixels = img_array.reshape(-1, 3)
-    hsv_pixels = np.array([colorsys.rgb_to_hsv(*(p/255.0)) for p in pixels])
-    mask = (
-        (hsv_pixels[:,1] > 0.25) &
-        (hsv_pixels[:,2] > 0.15) &
-        (hsv_pixels[:,2] < 0.95)
-    )
-    filtered_pixels = pixels[mask]
+    filtered_pixels = pixels[colorful_pixel_mask(pixels)]
     if len(filtered_pixels) == 0:
         filtered_pixels = pixels
-    pixel_tuples = [tuple(p) for p in filtered_pixels]
-    most_common = Counter(pixel_tuples).most_common(1)
-    if most_common:
-        dominant_color = most_common[0][0]
-    else:
-        dominant_color = tuple(map(int, np.median(filtered_pixels, axis=0)))
-    return tuple(map(int, dominant_color))
+    return dominant_color(filtered_pixels)
 
-def create_instagram_quadrant(image_path, output_dir, style_id, quadrant, model_name):
+def load_rgb_image(image_path, draft_size=None):
     """
-    Create a 4:5 Instagram-optimized quadrant from the source image and return the quadrant image (not saved yet)
+    Open an image and return it decoded as RGB, with transparency flattened onto white.
+    RGB sources (the common case) are returned as decoded, without a background copy;
+    palette images without transparency convert straight to RGB.
     """
-    try:
-        with Image.open(image_path) as img:
-            if img.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            width, height = img.size
-            target_width = 1080
-            target_height = 1350
-            crop_size = min(width, height)
-            left = (width - crop_size) // 2
-            top = (height - crop_size) // 2
-            right = left + crop_size
-            bottom = top + crop_size
-            square_img = img.crop((left, top, right, bottom))
-            quadrant_width = crop_size // 2
-            quadrant_height = crop_size // 2
-            quadrant_coords = [
-                (0, 0),
-                (quadrant_width, 0),
-                (0, quadrant_height),
-                (quadrant_width, quadrant_height)
-            ]
-            x, y = quadrant_coords[quadrant]
-            quadrant_img = square_img.crop((x, y, x + quadrant_width, y + quadrant_height))
-            # Crop to 4:5 aspect ratio
-            q_w, q_h = quadrant_img.size
-            if q_w > q_h * 0.8:
-                new_width = int(q_h * 0.8)
-                left = (q_w - new_width) // 2
-                quadrant_img = quadrant_img.crop((left, 0, left + new_width, q_h))
-            elif q_h > q_w * 1.25:
-                new_height = int(q_w * 1.25)
-                top = (q_h - new_height) // 2
-                quadrant_img = quadrant_img.crop((0, top, q_w, top + new_height))
-            quadrant_img = quadrant_img.resize((target_width, target_height), Image.Resampling.LANCZOS)
-            return quadrant_img
-    except Exception as e:
-        print(f"✗ Error processing {image_path}: {e}")
-        return None
+    with Image.open(image_path) as img:
+        if draft_size:
+            img.draft('RGB', draft_size)
+        if img.mode == 'RGB':
+            img.load()
+            return img
+        if img.mode == 'P' and 'transparency' not in img.info:
+            return img.convert('RGB')
+        if img.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+            return background
+        return img.convert('RGB')
+
+def load_square_image(image_path):
+    """
+    Open a source image once, flatten it onto white RGB and center-crop it to a square
+    """
+    # JPEG sources can decode at a reduced DCT scale; each quadrant only needs
+    # TARGET_HEIGHT pixels from half of the square (no-op for PNG)
+    img = load_rgb_image(image_path, draft_size=(TARGET_HEIGHT * 2, TARGET_HEIGHT * 2))
+    width, height = img.size
+    crop_size = min(width, height)
+    left = (width - crop_size) // 2
+    top = (height - crop_size) // 2
+    return img.crop((left, top, left + crop_size, top + crop_size))
+
+def create_instagram_quadrant(square_img, quadrant):
+    """
+    Crop one 4:5 quadrant from a square source image.
+    Returns the quadrant at source resolution; callers resize it to the Instagram size.
+    """
+    crop_size = square_img.size[0]
+    quadrant_width = crop_size // 2
+    quadrant_height = crop_size // 2
+    quadrant_coords = [
+        (0, 0),
+        (quadrant_width, 0),
+        (0, quadrant_height),
+        (quadrant_width, quadrant_height)
+    ]
+    x, y = quadrant_coords[quadrant]
+    quadrant_img = square_img.crop((x, y, x + quadrant_width, y + quadrant_height))
+    # Crop to 4:5 aspect ratio
+    q_w, q_h = quadrant_img.size
+    if q_w > q_h * 0.8:
+        new_width = int(q_h * 0.8)
+        left = (q_w - new_width) // 2
+        quadrant_img = quadrant_img.crop((left, 0, left + new_width, q_h))
+    elif q_h > q_w * 1.25:
+        new_height = int(q_w * 1.25)
+        top = (q_h - new_height) // 2
+        quadrant_img = quadrant_img.crop((0, top, q_w, top + new_height))
+    return quadrant_img
+
+def resize_quadrant(quadrant_img):
+    """
+    Resize a quadrant to the Instagram size.
+    Large quadrants are first shrunk by an integer factor with reduce(), which is much
+    cheaper than running the LANCZOS kernel over every source pixel.
+    """
+    factor = min(quadrant_img.width // TARGET_WIDTH, quadrant_img.height // TARGET_HEIGHT)
+    if factor >= 2:
+        quadrant_img = quadrant_img.reduce(factor)
+    return quadrant_img.resize((TARGET_WIDTH, TARGET_HEIGHT), Image.Resampling.LANCZOS)
 
 def process_image_set(args):
     """
-    Process a single image file: create quadrants, analyze color, and return info for saving.
+    Process a single image file: create quadrants, analyze color and save them as JPEGs.
+    The source is decoded and squared once; color analysis runs on the small
+    pre-resize quadrant before the final resize to the Instagram size.
+    Saving happens here in the worker, so only filenames travel back to the caller.
     """
-    image_file, output_dir, style_id, model_name = args
-    results = []
+    image_file, output_dir, style_id, model_name, optimize = args
     quadrants = []
-    colors = []
-    for quadrant in range(4):
-        quadrant_img = create_instagram_quadrant(
-            str(image_file),
-            output_dir,
-            style_id,
-            quadrant,
-            model_name
-        )
-        if quadrant_img is not None:
+    codes = []
+    try:
+        square_img = load_square_image(image_file)
+        for quadrant in range(4):
+            quadrant_img = create_instagram_quadrant(square_img, quadrant)
             color_rgb = get_quadrant_center_color(quadrant_img)
-            color_class = classify_color(color_rgb)
-            colors.append(color_class)
-            quadrants.append(quadrant_img)
-    if len(set(colors)) == 1:
-        folder = colors[0]
-    elif set(colors).issubset({'black', 'white'}):
+            codes.append(classify_code(*color_rgb))
+            quadrants.append(resize_quadrant(quadrant_img))
+    except Exception as e:
+        print(f"✗ Error processing {image_file}: {e}")
+        return (image_file, style_id, model_name, None, [])
+    if len(set(codes)) == 1:
+        folder = COLOR_NAMES[codes[0]]
+    elif set(codes).issubset({BLACK, WHITE}):
         folder = 'bw'
     else:
         folder = "misc"
-    return (image_file, style_id, model_name, quadrants, folder)
+    color_dir = os.path.join(output_dir, folder)
+    os.makedirs(color_dir, exist_ok=True)
+    filenames = []
+    for quadrant, quadrant_img in enumerate(quadrants):
+        output_filename = f"{model_name}_{style_id}_quadrant{quadrant}.jpg"
+        quadrant_img.save(
+            os.path.join(color_dir, output_filename),
+            'JPEG',
+            quality=80,
+            # Progressive encoding always builds optimized Huffman tables,
+            # so both are switched together
+            optimize=optimize,
+            progressive=optimize
+        )
+        filenames.append(output_filename)
+    return (image_file, style_id, model_name, folder, filenames)
 
-def process_source_images(source_dir="data/source-images", output_dir="data/processed-images"):
+def list_existing_outputs(output_dir):
+    """
+    Return the set of JPEG filenames already present in any color folder of output_dir
+    """
+    existing = set()
+    for _, _, files in os.walk(output_dir):
+        existing.update(name for name in files if name.endswith(".jpg"))
+    return existing
+
+def iter_image_tasks(source_path, output_dir, optimize, existing=None, skipped=None):
+    """
+    Yield process_image_set arguments for every PNG in the model subdirectories of source_path.
+    Sources whose four quadrants are all in `existing` are skipped and counted in `skipped`.
+    """
+    with os.scandir(source_path) as subdirs:
+        for subdir in subdirs:
+            if subdir.is_dir():
+                print(f"\nProcessing {subdir.name}...")
+                
+                # Process each image file; DirEntry carries the name and type without extra stats
+                with os.scandir(subdir.path) as entries:
+                    for entry in entries:
+                        if not os.path.normcase(entry.name).endswith(".png") or not entry.is_file():
+                            continue
+                        image_file = entry.path
+                        style_id = extract_style_id(entry.name)
+                        if not style_id:
+                            print(f"Warning: Could not extract style ID from {entry.name}")
+                            continue
+                        if existing and all(
+                            f"{subdir.name}_{style_id}_quadrant{quadrant}.jpg" in existing
+                            for quadrant in range(4)
+                        ):
+                            skipped[subdir.name] += 1
+                            continue
+                        yield (image_file, output_dir, style_id, subdir.name, optimize)
+
+def process_source_images(source_dir="data/source-images", output_dir="data/processed-images", optimize=False, force=False, processes=False):
     """
     Process all images in source-images directory
     
     Args:
         source_dir: Directory containing source images
         output_dir: Directory to save processed images
+        optimize: Save optimized progressive JPEGs (an extra encoding pass
+            for slightly smaller files) instead of single-pass baseline JPEGs
+        force: Reprocess sources whose quadrants already exist in output_dir
+        processes: Use a process pool instead of threads, for when the numpy
+            color analysis rather than Pillow dominates the run time
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -248,44 +340,35 @@ def process_source_images(source_dir="data/source-images", output_dir="data/proc
     total_processed = 0
     total_quadrants = 0
     color_stats = Counter()
-    tasks = []
+    skipped = Counter()
     
-    for subdir in source_path.iterdir():
-        if subdir.is_dir():
-            print(f"\nProcessing {subdir.name}...")
-            
-            # Process each image file
-            for image_file in subdir.glob("*.png"):
-                style_id = extract_style_id(image_file.name)
-                if not style_id:
-                    print(f"Warning: Could not extract style ID from {image_file.name}")
-                    continue
-                tasks.append((image_file, output_dir, style_id, subdir.name))
+    # One scan of the output tree lets incremental runs skip finished sources
+    existing = None if force else list_existing_outputs(output_dir)
     
-    with concurrent.futures.ProcessPoolExecutor() as executor:
+    # Pillow releases the GIL while decoding, resizing and encoding, so threads
+    # parallelize well by default. Workers save their own JPEGs and return only
+    # filenames, so a process pool costs a few bytes of IPC per image, not pixels.
+    # Tasks are submitted as the scan finds them, so work starts immediately.
+    if processes:
+        executor_class = concurrent.futures.ProcessPoolExecutor
+    else:
+        executor_class = concurrent.futures.ThreadPoolExecutor
+    with executor_class() as executor:
+        tasks = iter_image_tasks(source_path, output_dir, optimize, existing, skipped)
         for result in executor.map(process_image_set, tasks):
-            image_file, style_id, model_name, quadrants, folder = result
-            if not quadrants:
+            image_file, style_id, model_name, folder, filenames = result
+            if not filenames:
                 continue
             color_stats[folder] += 1
-            for quadrant, quadrant_img in enumerate(quadrants):
-                color_dir = os.path.join(output_dir, folder)
-                os.makedirs(color_dir, exist_ok=True)
-                output_filename = f"{model_name}_{style_id}_quadrant{quadrant}.jpg"
-                output_path = os.path.join(color_dir, output_filename)
-                quadrant_img.save(
-                    output_path,
-                    'JPEG',
-                    quality=80,
-                    optimize=True,
-                    progressive=True
-                )
+            for output_filename in filenames:
                 print(f"✓ Created {folder}/{output_filename}")
-                total_quadrants += 1
+            total_quadrants += len(filenames)
             total_processed += 1
     
     print(f"\n🎉 Processing complete!")
     print(f"📁 Processed {total_processed} source images")
+    if skipped:
+        print(f"⏭️  Skipped {sum(skipped.values())} already processed source images (use --force to redo)")
     print(f"🖼️  Created {total_quadrants} quadrant images")
     print(f"📂 Output saved to: {output_dir}")
     
@@ -297,6 +380,9 @@ def main():
     parser = argparse.ArgumentParser(description="Process source images into Instagram-optimized quadrants")
     parser.add_argument("--source", default="data/source-images", help="Source directory (default: data/source-images)")
     parser.add_argument("--output", default="data/processed-images", help="Output directory (default: data/processed-images)")
+    parser.add_argument("--optimize", action="store_true", help="Save optimized progressive JPEGs (slower, slightly smaller files)")
+    parser.add_argument("--force", action="store_true", help="Reprocess images whose quadrants already exist in the output directory")
+    parser.add_argument("--processes", action="store_true", help="Run workers in separate processes instead of threads")
     
     args = parser.parse_args()
     
@@ -308,7 +394,7 @@ def main():
     print(f"📂 Output: {args.output}")
     print()
     
-    process_source_images(args.source, args.output)
+    process_source_images(args.source, args.output, args.optimize, args.force, args.processes)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,4 +1,5 @@
 import re
+from pathlib import Path
 
 # List of old footer-related CSS selectors to remove
 FOOTER_SELECTORS = [
@@ -12,34 +13,43 @@ FOOTER_SELECTORS = [
 # Compile a regex pattern to match any of the selectors at the start of a CSS rule
 selector_pattern = re.compile(r'^(\s*)(' + '|'.join(FOOTER_SELECTORS) + r')[^\{]*\{', re.MULTILINE)
 
+# Braces, skipping over comments and strings so braces inside them don't count
+brace_pattern = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[{}]', re.DOTALL)
+
+CSS_PATH = Path('styles/main.css')
+
 # Read the CSS file
-with open('styles/main.css', 'r', encoding='utf-8') as f:
-    css = f.read()
+css = CSS_PATH.read_text(encoding='utf-8')
 
-# Function to remove a CSS block given the start index of the opening brace
-def remove_css_block(text, start):
+# Function to find the end of a CSS block given the index of its opening brace
+def find_block_end(text, open_brace):
     depth = 0
-    for i in range(start, len(text)):
-        if text[i] == '{':
+    for token in brace_pattern.finditer(text, open_brace):
+        if token.group() == '{':
             depth += 1
-        elif text[i] == '}':
+        elif token.group() == '}':
             depth -= 1
             if depth == 0:
-                return text[:start] + text[i+1:]
-    return text  # fallback
+                return token.end()
+    return -1
 
-# Remove all matching blocks
-matches = list(selector_pattern.finditer(css))
+# Remove all matching blocks in one forward pass, keeping the text between them
+kept = []
+cursor = 0
 removed = 0
-for match in reversed(matches):
-    start = match.start()
-    open_brace = css.find('{', start)
-    if open_brace != -1:
-        css = remove_css_block(css, open_brace)
-        removed += 1
-
-# Save the cleaned CSS
-with open('styles/main.css', 'w', encoding='utf-8') as f:
-    f.write(css)
-
-print(f"Removed {removed} old footer CSS blocks.") 
\ No newline at end of file
+for match in selector_pattern.finditer(css):
+    if match.start() < cursor:
+        continue  # Inside a block that was already removed
+    end = find_block_end(css, match.end() - 1)
+    if end == -1:
+        break  # Unbalanced braces: keep the rest as is
+    kept.append(css[cursor:match.start()])
+    cursor = end
+    removed += 1
+kept.append(css[cursor:])
+
+# Save the cleaned CSS in a single write, and only if something was removed
+if removed:
+    CSS_PATH.write_text(''.join(kept), encoding='utf-8')
+
+print(f"Removed {removed} old footer CSS blocks.")
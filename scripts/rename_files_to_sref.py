@@ -18,23 +18,25 @@ import re
 import shutil
 from pathlib import Path
 
+SREF_RE = re.compile(r'^(\d+)')
+
 def extract_sref(filename):
     """Extract the first numeric string from a filename."""
     # Remove extension first
     name_without_ext = os.path.splitext(filename)[0]
     
     # Find the first sequence of digits
-    match = re.match(r'^(\d+)', name_without_ext)
+    match = SREF_RE.match(name_without_ext)
     if match:
         return match.group(1)
     return None
 
 def rename_files_in_directory(directory_path, file_extension):
     """Rename all files in a directory to only contain the sref."""
-    directory = Path(directory_path)
-    if not directory.exists():
+    directory = os.fspath(directory_path)
+    if not os.path.isdir(directory):
         print(f"Directory does not exist: {directory_path}")
-        return
+        return 0, 0, 0
     
     renamed_count = 0
     skipped_count = 0
@@ -42,9 +44,16 @@ def rename_files_in_directory(directory_path, file_extension):
     
     print(f"\nProcessing {directory_path}...")
     
-    for file_path in directory.glob(f"*.{file_extension}"):
+    # One directory listing serves both the candidates and the target existence checks.
+    # Names are compared through normcase, as the filesystem (and glob) would on Windows.
+    with os.scandir(directory) as entries:
+        listing = [entry.name for entry in entries]
+    names = {os.path.normcase(name) for name in listing}
+    suffix = f".{file_extension}"
+    candidates = [name for name in listing if os.path.normcase(name).endswith(os.path.normcase(suffix))]
+    
+    for filename in sorted(candidates):
         try:
-            filename = file_path.name
             sref = extract_sref(filename)
             
             if not sref:
@@ -53,24 +62,23 @@ def rename_files_in_directory(directory_path, file_extension):
                 continue
             
             # Create new filename with sref and original extension
-            new_filename = f"{sref}.{file_extension}"
-            new_file_path = file_path.parent / new_filename
+            new_filename = f"{sref}{suffix}"
             
             # Skip if the file is already correctly named
-            if filename == new_filename:
-                print(f"  ✅ Already correct: {filename}")
+            if os.path.normcase(filename) == os.path.normcase(new_filename):
                 skipped_count += 1
                 continue
             
-            # Check if target file already exists
-            if new_file_path.exists():
+            # Check if target file already exists (os.rename would silently overwrite it on POSIX)
+            if os.path.normcase(new_filename) in names:
                 print(f"  ⚠️  Target already exists, skipping: {filename} -> {new_filename}")
                 error_count += 1
                 continue
             
             # Rename the file
-            file_path.rename(new_file_path)
-            print(f"  🔄 Renamed: {filename} -> {new_filename}")
+            os.rename(os.path.join(directory, filename), os.path.join(directory, new_filename))
+            names.discard(os.path.normcase(filename))
+            names.add(os.path.normcase(new_filename))
             renamed_count += 1
             
         except Exception as e:
@@ -6,29 +6,78 @@ This script will:
 1. Load the current api/images.json file
 2. Extract the sref (first numeric string) from each filename
 3. Update all image paths to use the new sref-only format
-4. Save the updated JSON file
+4. Save the updated JSON file (compact by default, indented with --pretty)
 
 Example:
 - "img/niji-6/1/1000932749_f29f4b24-244f-4505-9a0b-cccd447b1170.webp" -> "img/niji-6/1/1000932749.webp"
 """
 
+import argparse
+import concurrent.futures
+import hashlib
 import json
-import re
 import os
 from pathlib import Path
 
+# orjson is optional: same output as the json module calls below, much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def extract_sref(filename):
     """Extract the first numeric string from a filename."""
-    # Remove extension first
-    name_without_ext = os.path.splitext(filename)[0]
-    # Find the first sequence of digits
-    match = re.search(r'^(\d+)', name_without_ext)
-    if match:
-        return match.group(1)
-    return None
+    # Scan the leading digits directly; the extension's dot ends the run anyway
+    end = 0
+    while end < len(filename) and filename[end].isdecimal():
+        end += 1
+    return filename[:end] or None
 
-def update_images_json():
-    """Update the images.json file to use sref-only filenames."""
+def _rewrite_path(old_path):
+    """
+    Return the sref-only form of an image path, or None if it is already
+    sref-only or has no sref. Top-level so worker processes can run it.
+    """
+    # Split the URL-style path once: "<directory>/<filename>"
+    slash = old_path.rfind('/')
+    filename = old_path[slash + 1:]
+    
+    # Check if this is already in sref-only format
+    if '_' not in filename:
+        return None
+    
+    # Extract sref
+    sref = extract_sref(filename)
+    if not sref:
+        print(f"    ⚠️  Could not extract sref from: {filename}")
+        return None
+    
+    # Get the extension
+    dot = filename.rfind('.')
+    extension = filename[dot:] if dot > 0 else ''
+    
+    # Keep the directory prefix (and its slash) as is
+    return f"{old_path[:slash + 1]}{sref}{extension}"
+
+def rewrite_image_path(image):
+    """
+    Rewrite an images.json entry's path to the sref-only filename, in place.
+    Returns True if the path was changed.
+    """
+    new_path = _rewrite_path(image['path'])
+    if new_path is None:
+        return False
+    image['path'] = new_path
+    return True
+
+def update_images_json(pretty=False, jobs=1):
+    """
+    Update the images.json file to use sref-only filenames.
+    
+    The file is only read by the site, so it is written without indentation
+    unless pretty is set. With jobs > 1 the paths are rewritten in that many
+    worker processes; at today's few thousand entries serial is faster.
+    """
     
     # Path to the JSON file
     json_path = Path("api/images.json")
@@ -39,9 +88,14 @@ def update_images_json():
     
     print(f"📖 Loading {json_path}...")
     
+    # Parse straight from the raw bytes (no decoded str copy); the buffer
+    # is released right away, before the updated document is serialized.
+    # Only its digest is kept, to detect a no-op save.
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        raw = json_path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        original_digest = hashlib.blake2b(raw).digest()
+        del raw
     except Exception as e:
         print(f"❌ Error loading JSON: {e}")
         return False
@@ -52,64 +106,72 @@ def update_images_json():
     updated_images = 0
     skipped_images = 0
     
-    # Process each set
-    for set_name, set_data in data['sets'].items():
-        print(f"  Processing {set_name}...")
-        
-        for image in set_data['images']:
-            total_images += 1
-            old_path = image['path']
-            
-            # Extract filename from path
-            filename = os.path.basename(old_path)
-            
-            # Check if this is already in sref-only format
-            if '_' not in filename:
-                skipped_images += 1
-                continue
-            
-            # Extract sref
-            sref = extract_sref(filename)
-            if not sref:
-                print(f"    ⚠️  Could not extract sref from: {filename}")
-                skipped_images += 1
-                continue
-            
-            # Get the directory and extension
-            directory = os.path.dirname(old_path)
-            extension = os.path.splitext(filename)[1]
-            
-            # Create new path
-            new_filename = f"{sref}{extension}"
-            new_path = os.path.join(directory, new_filename)
-            
-            # Update the path
-            image['path'] = new_path
-            updated_images += 1
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        # Process each set
+        for set_name, set_data in data['sets'].items():
+            print(f"  Processing {set_name}...")
             
-            if updated_images % 1000 == 0:
-                print(f"    Updated {updated_images} images...")
+            images = set_data['images']
+            if executor is None:
+                # map() drives the loop in C; each call updates one entry in place
+                updated = sum(map(rewrite_image_path, images))
+            else:
+                # Workers get and return plain path strings; entries are updated here
+                updated = 0
+                paths = [image['path'] for image in images]
+                for image, new_path in zip(images, executor.map(_rewrite_path, paths, chunksize=256)):
+                    if new_path is not None:
+                        image['path'] = new_path
+                        updated += 1
+            total_images += len(images)
+            updated_images += updated
+            skipped_images += len(images) - updated
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     print(f"\n📊 Summary:")
     print(f"  Total images: {total_images}")
     print(f"  Updated: {updated_images}")
     print(f"  Skipped (already correct): {skipped_images}")
     
-    # Save the updated JSON
-    print(f"\n💾 Saving updated {json_path}...")
-    
+    tmp_path = json_path.with_suffix(".json.tmp")
     try:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Encode the whole document first and write it in one call; json.dump
+        # would instead issue a write per small encoder chunk
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+        elif pretty:
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        else:
+            payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        if hashlib.blake2b(payload).digest() == original_digest:
+            print(f"\n✅ {json_path} is already up to date, nothing to write")
+            return True
+        
+        # Save the updated JSON next to the original, then swap it in atomically
+        # so an interrupted run never leaves a half-written images.json behind
+        print(f"\n💾 Saving updated {json_path}...")
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, json_path)
         print("✅ Successfully updated images.json!")
         return True
     except Exception as e:
         print(f"❌ Error saving JSON: {e}")
+        tmp_path.unlink(missing_ok=True)
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update api/images.json to match the sref-only filenames")
+    parser.add_argument("--pretty", action="store_true", help="Write indented JSON instead of compact JSON")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for rewriting paths (default: 1, serial)")
+    args = parser.parse_args()
+    
     print("🔄 Updating api/images.json to match new sref-only filenames...")
-    success = update_images_json()
+    success = update_images_json(pretty=args.pretty, jobs=args.jobs)
     if success:
         print("🎉 Done! The images.json file now matches the renamed image files.")
     else:
@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-import re
 import json
 from datetime import datetime
 
@@ -14,13 +13,14 @@ except Exception as e:
     print(f"❌ Error reading docs.html: {e}")
     exit(1)
 
-# Test regex pattern
-pattern = re.compile(r'(<script type="application/ld\+json">)(.*?)(</script>)', re.DOTALL)
-match = pattern.search(html)
+# Test locating the block (same fixed markers as scripts/deploy/update_schema.py)
+SCHEMA_OPEN = '<script type="application/ld+json">'
+start = html.find(SCHEMA_OPEN)
+end = -1 if start < 0 else html.find('</script>', start)
 
-if match:
+if start >= 0 and end >= 0:
     print("✅ Found schema block")
-    prefix, json_text, suffix = match.groups()
+    json_text = html[start + len(SCHEMA_OPEN):end]
     print(f"   JSON text length: {len(json_text)} characters")
     print(f"   JSON preview: {json_text[:100]}...")
     